@@ -1,39 +1,73 @@
 # main.py
 # inspired by ChatGPT
 
-from scheduler import Scheduler
-import pandas as pd
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+def emit_plan(scheduler, idx, plan):
+    """
+    Save one plan as a PNG picture and as an Excel file.
+
+    This is a top-level function so that it can be sent to worker processes.
+
+    Parameters:
+    - scheduler (Scheduler): The scheduler providing visualize_plan and export_excel.
+    - idx (int): The position of the plan in the list of plans (0 for the first plan).
+    - plan (pd.DataFrame): The plan to save.
+    """
+    # Form a filename like "Arbeitsplan_Vorschlag_1", "Arbeitsplan_Vorschlag_2", etc.
+    filename = f"Arbeitsplan_Vorschlag_{idx+1}"
+
+    # Create and save a picture (PNG) illustrating the schedule in a grid format.
+    scheduler.visualize_plan(plan, filename=f"{filename}.png")
+
+    # Save the schedule as an Excel file, with people as rows and time slots as columns.
+    scheduler.export_excel(plan, filename=f"{filename}.xlsx")
+
 
 if __name__ == "__main__":
-    # Read an Excel file named "Availability.xlsx".
-    # The sheet called "Tabelle1" is used, and the first row is skipped as it may contain a title.
-    availability_df = pd.read_excel("Availability.xlsx", sheet_name="Tabelle1", header=1)
-    
-    # Remove any extra spaces around column names so that " Name " becomes "Name".
-    availability_df.columns = availability_df.columns.str.strip()
-    
-    # Rename the first column to "Name", assuming it contains the names of the people.
-    availability_df.rename(columns={availability_df.columns[0]: "Name"}, inplace=True)
-
-    # Create a Scheduler object, providing the table of availability.
-    scheduler = Scheduler(availability_df)
-    
-    # Convert each row of the table into a Person object, capturing availability details.
-    scheduler.parse_availability()
+    # Optional command line setting: how many processes save the plans (PNG and Excel files).
+    parser = argparse.ArgumentParser(description="Generate work schedule proposals from Availability.xlsx.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes used to save the plans (default: 1, one after another)",
+    )
+    args = parser.parse_args()
 
-    # Generate three different possible work schedules; each returned plan is a small table.
-    plans = scheduler.generate_plans(num_plans=3)
+    # "Availability.xlsx" is expected next to this script, independent of the current working directory.
+    availability_path = Path(__file__).with_name("Availability.xlsx")
+
+    # Stop right away with a clear message if the file is missing, before paying for the slow pandas import.
+    if not availability_path.exists():
+        sys.exit(f"Availability file not found: {availability_path}")
 
-    # For each generated plan:
-    for idx, plan in enumerate(plans):
-        # Form a filename like "Arbeitsplan_Vorschlag_1", "Arbeitsplan_Vorschlag_2", etc.
-        filename = f"Arbeitsplan_Vorschlag_{idx+1}"
+    # Importing scheduler loads pandas; matplotlib is only loaded once the first plan is drawn
+    # (worker processes import scheduler as well when they receive the scheduler).
+    from scheduler import Scheduler
 
-        # Create and save a picture (PNG) illustrating the schedule in a grid format.
-        scheduler.visualize_plan(plan, filename=f"{filename}.png")
+    # Load the availability table and create a Scheduler object from it.
+    # Each row of the table is converted into a Person object, capturing availability details.
+    scheduler = Scheduler.load(str(availability_path))
+
+    # Generate three different possible work schedules; each returned plan is a small table.
+    plans = scheduler.generate_plans(num_plans=3)
 
-        # Save the schedule as an Excel file, with people as rows and time slots as columns.
-        scheduler.export_excel(plan.copy(), filename=f"{filename}.xlsx")
+    # Drawing and exporting the plans are independent of each other, so they can be spread over several processes
+    # with --workers. This is off by default: every worker has to receive a copy of the scheduler and import
+    # matplotlib itself, which for three plans costs more time than saving them one by one.
+    max_workers = min(len(plans), args.workers)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # list(...) waits for all plans and re-raises any error from a worker process.
+            list(executor.map(emit_plan, [scheduler] * len(plans), range(len(plans)), plans))
+    else:
+        for idx, plan in enumerate(plans):
+            emit_plan(scheduler, idx, plan)
 
     # Indicate that scheduling has finished.
     print("scheduling has finished.")
@@ -1,6 +1,10 @@
 # person.py
 # inspired by ChatGPT
 
+# Length in hours of each time slot; defined once here instead of being rebuilt on every call.
+HOURS_PER_SLOT = {"10-12": 2, "12-14": 2, "14-16": 2, "16-18": 2}
+
+
 class Person:
     """
     Represents one person (an employee) including:
@@ -10,7 +14,7 @@ class Person:
       - list of slots that have been assigned (assigned_blocks)
     """
 
-    def __init__(self, name, availability, max_blocks):
+    def __init__(self, name, availability, max_blocks, block_index=None):
         """
         Initialize a Person instance.
 
@@ -18,18 +22,37 @@ class Person:
         - name (str): The person's name, for example "Alice".
         - availability (dict): Each key is a (day, time) tuple, and each value is a number (0 = unavailable, 1 or higher = available).
         - max_blocks (int): The maximum number of time slots this person may be assigned.
+        - block_index (dict): Maps each (day, time) tuple to its bit number in the bitmasks below
+          (Scheduler passes its own block positions here). If omitted, the slots are numbered
+          in the order they are listed in availability.
         """
         self.name = name
         self.availability = availability
         self.max_blocks = max_blocks
         # Start with no assigned slots
         self.assigned_blocks = []
+        # Bit number i of a bitmask stands for the slot with block_index[slot] == i
+        if block_index is None:
+            block_index = {block: i for i, block in enumerate(availability)}
+        self._block_bits = {block: 1 << i for block, i in block_index.items()}
+        # Bitmasks of the slots with availability >= min_level, keyed by min_level (availability does not change)
+        self._level_masks = {}
+        # Bitmask of all slots this person is available for (availability >= 1)
+        self.available_mask = self._level_mask(1)
+        # Number of slots available at level >= 1, used in every sort key (availability does not change)
+        self._n_available = self.available_mask.bit_count()
+        # Bitmask of the slots currently assigned (kept in step with assigned_blocks)
+        self.assigned_mask = 0
+        # Running total of the assigned hours (kept in step with assigned_blocks)
+        self._assigned_hours = 0
 
     def reset_blocks(self):
         """
         Clear any previously assigned slots so that the person has none before a new scheduling attempt.
         """
         self.assigned_blocks = []
+        self.assigned_mask = 0
+        self._assigned_hours = 0
 
     def block_count(self):
         """
@@ -37,6 +60,20 @@ class Person:
         """
         return len(self.assigned_blocks)
 
+    def _level_mask(self, min_level):
+        """
+        Return a bitmask with one bit set for every slot whose availability is >= min_level.
+        The mask is built once per min_level and then reused.
+        """
+        mask = self._level_masks.get(min_level)
+        if mask is None:
+            mask = 0
+            for block, level in self.availability.items():
+                if level >= min_level:
+                    mask |= self._block_bits.get(block, 0)
+            self._level_masks[min_level] = mask
+        return mask
+
     def available_blocks_count(self, min_level=1):
         """
         Count how many slots are marked with availability >= min_level (default is 1).
@@ -47,11 +84,11 @@ class Person:
         Returns:
         - int: The count of slots meeting or exceeding the threshold.
         """
-        count = 0
-        for level in self.availability.values():
-            if level >= min_level:
-                count += 1
-        return count
+        # The default level is asked for in every sort key, so its count is stored directly.
+        if min_level == 1:
+            return self._n_available
+        # Counting the set bits of the (cached) bitmask is a single fast operation instead of a loop over all slots.
+        return self._level_mask(min_level).bit_count()
 
     def can_receive_block(self, block):
         """
@@ -63,13 +100,17 @@ class Person:
         Returns:
         - bool: True if availability for that slot is greater than zero.
         """
-        return block in self.availability and self.availability[block] > 0
+        # The slot's bit in available_mask is set exactly when its availability is >= 1; slots that are not
+        # listed have no bit and count as unavailable.
+        return bool(self.available_mask & self._block_bits.get(block, 0))
 
     def add_block(self, block):
         """
-        Assign the specified slot to this person by adding it to assigned_blocks.
+        Assign the specified slot to this person by adding it to assigned_blocks (and setting its bit in assigned_mask).
         """
         self.assigned_blocks.append(block)
+        self.assigned_mask |= self._block_bits.get(block, 0)
+        self._assigned_hours += HOURS_PER_SLOT.get(block[1], 0)
 
     def wants_block(self, block):
         """
@@ -92,8 +133,5 @@ class Person:
         Returns:
         - int: The sum of hours for all assigned slots.
         """
-        hours_per_slot = {"10-12": 2, "12-14": 2, "14-16": 2, "16-18": 2}
-        total = 0
-        for day, time in self.assigned_blocks:
-            total += hours_per_slot.get(time, 0)
-        return total
+        # The total is updated in add_block and reset_blocks, so no loop over the assigned slots is needed here.
+        return self._assigned_hours
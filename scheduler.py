@@ -1,13 +1,90 @@
 # scheduler.py
 # inspired by ChatGPT
 
+import json
+import os
+import numpy as np
 import pandas as pd
-from person import Person
+import xlsxwriter
+from person import Person, HOURS_PER_SLOT
 from collections import defaultdict
-import matplotlib.pyplot as plt
-import seaborn as sns
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 import random
 
+
+def load_availability(excel_path, cache_path=None):
+    """
+    Load the availability table, reusing a cached copy when the Excel file has not changed.
+
+    Parsing an Excel file means unpacking and reading XML, which is slow. After the first run, the
+    prepared table is stored as a JSON file next to the Excel file, together with the Excel file's exact
+    modification time and size. As long as both still match, the cache is read instead, which skips the
+    Excel parsing entirely. Any other Excel file (also an older copy restored from a backup) is read again.
+
+    JSON only holds plain data, so unlike a pickle, a cache file that arrives with a shared or zipped
+    project folder cannot run any code when it is loaded.
+
+    Parameters:
+    - excel_path (str): Path to the Excel file with the availability.
+    - cache_path (str): Path of the cache file; by default the Excel path with the suffix ".cache.json".
+
+    Returns:
+    - pd.DataFrame: The availability table with stripped column names and a "Name" column.
+    """
+    excel_file = Path(excel_path)
+    cache_file = Path(cache_path) if cache_path is not None else excel_file.with_suffix(".cache.json")
+
+    # Fingerprint of the Excel file; the cache is only used if it was made from a file with the same one.
+    excel_stat = excel_file.stat()
+    source = [excel_stat.st_mtime_ns, excel_stat.st_size]
+
+    # A cache that cannot be read (damaged file, other format, ...) or belongs to another version of the
+    # Excel file is ignored, and the Excel file is read instead; the cache is then rebuilt below.
+    try:
+        with open(cache_file, encoding="utf-8") as file:
+            cache = json.load(file)
+        if cache["source"] == source:
+            return pd.DataFrame({
+                column: pd.Series(values, dtype=dtype)
+                for column, dtype, values in zip(cache["columns"], cache["dtypes"], cache["values"])
+            })
+    except Exception:
+        pass
+
+    # Read the Excel file (normally "Availability.xlsx").
+    # The sheet called "Tabelle1" is used, and the first row is skipped as it may contain a title.
+    # The "calamine" engine (a Rust-based reader) parses the file much faster than the default openpyxl engine.
+    availability_df = pd.read_excel(excel_file, sheet_name="Tabelle1", header=1, engine="calamine")
+
+    # Remove any extra spaces around column names so that " Name " becomes "Name".
+    # A plain list comprehension is enough for ~22 columns and avoids the pandas string-accessor overhead.
+    availability_df.columns = [str(column).strip() for column in availability_df.columns]
+
+    # Rename the first column to "Name", assuming it contains the names of the people.
+    availability_df.rename(columns={availability_df.columns[0]: "Name"}, inplace=True)
+
+    # Store the prepared table (values, column names and column types) so that the next run can skip the
+    # Excel parsing. It is first written to a temporary file and then moved into place in one step, so an
+    # interrupted run never leaves a half-written cache behind. If the cache cannot be written (e.g. a
+    # read-only directory), the table is still returned; the next run simply reads the Excel file again.
+    # The values are stored column by column, so each column is rebuilt with its type in a single step.
+    cache = {
+        "source": source,
+        "columns": availability_df.columns.tolist(),
+        "dtypes": [str(dtype) for dtype in availability_df.dtypes],
+        "values": [availability_df[column].tolist() for column in availability_df.columns],
+    }
+    temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_file, "w", encoding="utf-8") as file:
+            json.dump(cache, file)
+        os.replace(temp_file, cache_file)
+    except (OSError, TypeError, ValueError):
+        temp_file.unlink(missing_ok=True)
+    return availability_df
+
+
 class Scheduler:
     """
     This class transforms a table of availability into one or more work schedules.
@@ -29,6 +106,21 @@ class Scheduler:
         # This list will hold Person objects after parsing availability
         self.persons = []
 
+        # After parsing, this matrix holds every person's availability in one compact block of memory:
+        # one row per person (same order as self.persons), one column per block (same order as self.blocks).
+        self.avail = None
+
+        # Figure reused by visualize_plan (created on first use)
+        self._fig = None
+
+        # After parsing, this list holds, for every block (same order as self.blocks), the row indices
+        # of all persons who are available for it. It is built once and reused by every plan.
+        self.available_persons = []
+
+        # After parsing, this list holds, for every block, a dictionary mapping each availability level
+        # (1, 2, 3, ...) to the row indices of the persons who marked the block with exactly that level.
+        self.level_persons = []
+
         # Define the weekdays that will appear in the schedule (Monday through Friday)
         self.days = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag']
 
@@ -39,39 +131,120 @@ class Scheduler:
         # For example: ('Montag', '10-12'), ('Montag', '12-14'), ..., ('Freitag', '16-18')
         self.blocks = [(day, time) for day in self.days for time in self.times]
 
+        # Column labels of the pivoted plan tables, one per block: "Montag 10-12", ..., "Freitag 16-18"
+        self._full_order = [f"{day} {time}" for day, time in self.blocks]
+
+        # Number of people required for each block (same order as self.blocks), computed once:
+        #   - If the time is '10-12', exactly 2 people are needed.
+        #   - Otherwise, 3 people are needed.
+        self.needed = [2 if time == '10-12' else 3 for day, time in self.blocks]
+
+        # Day index, time index and number of people needed for each block (same order as self.blocks),
+        # so that the scheduling loops read three integers instead of unpacking and comparing strings.
+        self._blocks_info = tuple(
+            (b // len(self.times), b % len(self.times), self.needed[b])
+            for b in range(len(self.blocks))
+        )
+
+        # Position of each (day, time) block in self.blocks. It is passed to every Person, so that bit number b
+        # of a person's bitmasks stands for self.blocks[b] (the scheduling loops rely on this).
+        self._block_index = {block: b for b, block in enumerate(self.blocks)}
+
+        # Lookup table for the gap check: for one day, entry (available << slots_per_day) | assigned
+        # tells whether the "assigned" slots leave an available slot empty in between (see _has_gap).
+        # With 4 time slots per day, this is a table of 2^8 = 256 entries, filled once here.
+        self._slots_per_day = len(self.times)
+        self._day_bits = (1 << self._slots_per_day) - 1
+        self._gap_table = [
+            self._has_gap(combined >> self._slots_per_day, combined & self._day_bits)
+            for combined in range(1 << (2 * self._slots_per_day))
+        ]
+
+        # For each block, a bitmask covering all blocks of the same day. "person.assigned_mask & mask"
+        # then tells in one operation whether the person already works on that day.
+        self._day_masks = [
+            self._day_bits << (b - b % self._slots_per_day)
+            for b in range(len(self.blocks))
+        ]
+
+    def __getstate__(self):
+        """
+        Return the state used when this Scheduler is copied into a worker process.
+        The reusable figure is left out; a worker creates its own when it draws a plan.
+        """
+        state = self.__dict__.copy()
+        state["_fig"] = None
+        return state
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an availability Excel file and return a Scheduler whose persons are already parsed.
+
+        Every call returns a new Scheduler with its own Person objects, so callers never share assignment
+        state. The slow part, parsing the Excel file, is already skipped by load_availability's cache
+        as long as the file has not changed.
+
+        Parameters:
+        - path (str): Path to the Excel file with the availability.
+
+        Returns:
+        - Scheduler: A new Scheduler for the file, with parse_availability() already called.
+        """
+        scheduler = cls(load_availability(path))
+        scheduler.parse_availability()
+        return scheduler
+
     def parse_availability(self):
         """
         Convert each row of the DataFrame into a Person object.
 
-        For each row (each person):
-          1. Retrieve the name from the "Name" column. If "Name" is missing, use the first column.
-          2. Build a dictionary of availability: each (day, time) maps to the person's availability value.
+        Steps:
+          1. Take the names from the "Name" column. If "Name" is missing, use the first column.
+          2. Copy all availability values in one step into the int8 matrix self.avail.
              The DataFrame is assumed to list these availability values in the columns immediately after the name,
-             in the order of self.days and self.times.
-          3. Read the final column as max_blocks (the maximum number of hours or blocks this person can work).
-          4. Create a Person object using name, availability dictionary, and max_blocks.
-             Add this Person to the internal list self.persons.
+             in the order of self.days and self.times. Empty cells are treated as 0 (not available).
+          3. Read the final column as max_blocks (the maximum number of hours or blocks each person can work).
+          4. For each person, build a dictionary of availability from their matrix row, create a Person object
+             using name, availability dictionary, and max_blocks, and add it to the internal list self.persons.
+          5. For each block, store the indices of all persons available for it in self.available_persons,
+             and the same indices grouped by availability level in self.level_persons.
         """
-        for _, row in self.df.iterrows():
-            # Get the person's name; fallback to the first column if "Name" is not present.
-            name = row.get("Name", row[row.index[0]])
-
-            # Build the availability dictionary.
-            # The availability values are taken in the exact order of self.days and self.times.
-            availability = {}
-            idx = 1  # Start from the second column (index 1) since index 0 is the name
-            for day in self.days:
-                for time in self.times:
-                    availability[(day, time)] = row.iloc[idx]
-                    idx += 1
-
-            # The last column of the row indicates the maximum hours (or blocks) this person can work.
-            max_blocks = row.iloc[-1]
-
-            # Instantiate a Person and add to the list.
-            self.persons.append(Person(name, availability, max_blocks))
-
-    def generate_plans(self, num_plans=3):
+        # 1. Get the names; fallback to the first column if "Name" is not present.
+        name_column = self.df["Name"] if "Name" in self.df.columns else self.df.iloc[:, 0]
+        names = name_column.tolist()
+
+        # 2. Copy the availability columns (second column onwards, one per block) into a single int8 matrix.
+        # This replaces reading every cell separately, which is the slowest way to go through a DataFrame.
+        availability_columns = self.df.iloc[:, 1:1 + len(self.blocks)]
+        self.avail = availability_columns.fillna(0).to_numpy(dtype=np.int8)
+
+        # 3. The last column indicates the maximum hours (or blocks) each person can work.
+        max_blocks_list = self.df.iloc[:, -1].tolist()
+
+        # 4. Instantiate a Person per row and add to the list.
+        # tolist() turns each matrix row into plain Python integers, which are fastest for dictionary lookups.
+        for name, levels, max_blocks in zip(names, self.avail.tolist(), max_blocks_list):
+            availability = dict(zip(self.blocks, levels))
+            self.persons.append(Person(name, availability, max_blocks, self._block_index))
+
+        # 5. Build the "block → available persons" index with one column scan of the matrix per block,
+        # so that the scheduling passes no longer need to check every person for every block.
+        self.available_persons = [
+            np.flatnonzero(self.avail[:, b] > 0).tolist()
+            for b in range(len(self.blocks))
+        ]
+        # Group the same indices by level, so that a priority pass finds the persons with a given level
+        # for a block directly, instead of asking every available person for their level.
+        self.level_persons = []
+        for b in range(len(self.blocks)):
+            column = self.avail[:, b]
+            self.level_persons.append({
+                int(level): np.flatnonzero(column == level).tolist()
+                for level in np.unique(column[column > 0])
+            })
+
+    def generate_plans(self, num_plans=3, max_workers=1, solver="greedy", time_limit=10.0):
         """
         Produce a specified number of scheduling proposals.
 
@@ -80,18 +253,145 @@ class Scheduler:
           b) Call an internal helper to build a single plan, passing a seed for reproducible randomness.
           c) Collect each generated plan (as a DataFrame) in a list.
 
+        The proposals do not depend on each other. With max_workers > 1 they are built in that many
+        worker processes at the same time; each worker uses its own copy of the persons, so the Person
+        objects of this Scheduler are left untouched. Starting processes costs far more than building one
+        plan for a typical team, so this only pays off for large rosters or many proposals.
+
+        With solver="cp-sat", the proposals are instead computed by a constraint solver that plans the
+        whole week at once (see _generate_cp_sat_plans). This requires the optional "ortools" package.
+
+        Parameters:
+        - num_plans (int): How many proposals to build.
+        - max_workers (int): Number of worker processes; 1 (the default) builds the plans one after another.
+          Only used by the "greedy" solver.
+        - solver (str): "greedy" (the default, block-by-block algorithm described above) or "cp-sat".
+        - time_limit (float): Only used by the "cp-sat" solver: maximum number of seconds per proposal.
+
         Returns:
         - A list of DataFrames; each DataFrame represents one possible work schedule.
+          The plans are the same for any max_workers, since each one only depends on its seed.
         """
-        plans = []
+        if solver == "cp-sat":
+            return self._generate_cp_sat_plans(num_plans, time_limit=time_limit)
+        if solver != "greedy":
+            raise ValueError(f'Unknown solver "{solver}"; use "greedy" or "cp-sat".')
 
-        for i in range(num_plans):
-            # a) Reset all assigned blocks before starting a new plan
-            for person in self.persons:
-                person.reset_blocks()
+        max_workers = min(max_workers, num_plans)
 
-            # b) Generate one schedule, using the index i as a random seed
-            plans.append(self._generate_single_plan(seed=i))
+        # Build the plans in parallel worker processes, using the index i as a random seed
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(self._generate_plan_for_seed, range(num_plans)))
+
+        # Otherwise build them one after another, using the index i as a random seed
+        return [self._generate_plan_for_seed(i) for i in range(num_plans)]
+
+    def _generate_plan_for_seed(self, seed):
+        """
+        Reset all assigned blocks and build one plan with the given seed (steps a and b of generate_plans).
+        This is a separate method so that it can also be run in a worker process.
+        """
+        # a) Reset all assigned blocks before starting a new plan
+        for person in self.persons:
+            person.reset_blocks()
+
+        # b) Generate one schedule with the given seed
+        return self._generate_single_plan(seed=seed)
+
+    def _generate_cp_sat_plans(self, num_plans, time_limit=10.0):
+        """
+        Build proposals with the CP-SAT constraint solver from Google OR-Tools.
+
+        Instead of filling the blocks one after another, the whole week is modelled at once:
+          - One yes/no variable per (person, block) for every block the person is available for.
+          - Hard rules: no block gets more people than needed, nobody gets more hours than max_blocks,
+            and nobody gets a gap sequence (same rule as in the greedy passes, see _creates_gap).
+          - Goal, in order of importance: staff as many of the required positions as possible, then prefer
+            higher availability levels (3 over 2 over 1), and keep the hours of the busiest person low.
+        Every further proposal must differ from all earlier ones in at least one assignment,
+        and uses its index as the solver's random seed.
+
+        The Person objects are not modified.
+
+        Parameters:
+        - num_plans (int): How many proposals to build.
+        - time_limit (float): Maximum number of seconds the solver may spend on each proposal
+          (so up to num_plans * time_limit seconds in total).
+
+        Returns:
+        - A list of DataFrames in the same format as the greedy plans
+          (shorter than num_plans if no further distinct plan exists).
+        """
+        # OR-Tools is only needed for this solver, so it is imported here instead of at the top of the file
+        try:
+            from ortools.sat.python import cp_model
+        except ImportError as err:
+            raise ImportError('The "cp-sat" solver requires OR-Tools: pip install ortools') from err
+
+        model = cp_model.CpModel()
+
+        # x[(i, b)] is 1 if person i works block b; only created where the person is available
+        x = {
+            (i, b): model.NewBoolVar(f"x_{i}_{b}")
+            for b, indices in enumerate(self.available_persons)
+            for i in indices
+        }
+
+        # A block never gets more people than needed
+        for b, indices in enumerate(self.available_persons):
+            model.Add(sum(x[i, b] for i in indices) <= self.needed[b])
+
+        # Nobody works more hours than allowed, and max_hours is at least everybody's hours
+        block_hours = [HOURS_PER_SLOT[time] for day, time in self.blocks]
+        max_hours = model.NewIntVar(0, sum(block_hours), "max_hours")
+        for i, person in enumerate(self.persons):
+            hours = sum(block_hours[b] * x[i, b] for b in range(len(self.blocks)) if (i, b) in x)
+            model.Add(hours <= int(person.max_blocks))
+            model.Add(hours <= max_hours)
+
+        # No gap sequences, as a hard rule like in the greedy passes (see _creates_gap): on a day with 3 or more
+        # available slots, an available slot between two assigned slots of that day must be assigned as well
+        for i in range(len(self.persons)):
+            for day_start in range(0, len(self.blocks), self._slots_per_day):
+                day_blocks = [
+                    b for b in range(day_start, day_start + self._slots_per_day)
+                    if (i, b) in x
+                ]
+                if len(day_blocks) < 3:
+                    continue
+                for middle in day_blocks[1:-1]:
+                    for first in day_blocks:
+                        for last in day_blocks:
+                            if first < middle < last:
+                                model.Add(x[i, first] + x[i, last] - x[i, middle] <= 1)
+
+        # Staffing dominates everything else; a staffed position is worth more than all other terms together
+        model.Maximize(
+            1000 * sum(x.values())
+            + sum(int(self.avail[i, b]) * var for (i, b), var in x.items())
+            - max_hours
+        )
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+
+        plans = []
+        for seed in range(num_plans):
+            solver.parameters.random_seed = seed
+            status = solver.Solve(model)
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                break
+
+            # Fill the slots in block order, persons in their original order
+            chosen = sorted((key for key, var in x.items() if solver.Value(var)), key=lambda key: (key[1], key[0]))
+            slots = [[] for _ in self.blocks]
+            for i, b in chosen:
+                slots[b].append(self.persons[i].name)
+            plans.append(self._plan_to_dataframe(slots))
+
+            # The next proposal has to leave out at least one assignment of this one
+            model.Add(sum(x[key] for key in chosen) <= len(chosen) - 1)
 
         return plans
 
@@ -100,9 +400,10 @@ class Scheduler:
         Build one schedule (plan) of assignments.
 
         Steps in detail:
-          1. If a seed is provided, set it for the random number generator.
-          2. Create an empty structure `slots` that will map each (day, time) to a list of assigned names.
+          1. Create a random number generator for this plan, seeded with the given seed (if any).
+          2. Create an empty structure `slots` holding, for each block index (position in self.blocks), a list of assigned names.
           3. Sort persons by the number of slots they can work (descending), then shuffle to mix order.
+             Using the precomputed index, list the available persons for each block in this order.
           4. Define a helper function assign_blocks(priority_level) that:
              - Iterates over every (day, time) block in self.blocks.
              - For each block, determines how many people are needed (2 for '10-12', otherwise 3).
@@ -117,51 +418,61 @@ class Scheduler:
                subject to gap-sequence checks and capacity.
           7. For any remaining free blocks (not fully staffed), fill them with whichever available persons remain,
              respecting their capacity and gap rules.
-          8. After all assignments, build a list of dictionaries (plan_data) with one entry per assigned (day, time, person).
+          8. After all assignments, build three parallel lists (days, times, persons) with one entry per assignment.
           9. Compute total hours per person (each block = 2 hours).
-         10. Create a DataFrame from plan_data and include a column "Hours" with each person’s total hours.
+         10. Create a DataFrame from these lists and include a column "Hours" with each person’s total hours.
          11. Return this final DataFrame representing the single plan.
         """
-        if seed is not None:
-            random.seed(seed)
+        # 1. Use a dedicated random number generator for this plan instead of reseeding the global one:
+        #    plans stay reproducible for a given seed, and other code using `random` is not affected.
+        rng = random.Random(seed)
 
-        # 2. Initialize the slots structure so that each (day, time) maps to an empty list of names
-        slots = defaultdict(list)
-        for block in self.blocks:
-            slots[block] = []
+        # 2. Initialize the slots structure: slots[b] is the list of names assigned to self.blocks[b].
+        # A plain list indexed by block number avoids hashing a (day, time) tuple on every access.
+        slots = [[] for _ in self.blocks]
 
         # 3. Sort persons by how many blocks they can work (descending), then shuffle to mix priorities
         persons_sorted = sorted(self.persons, key=lambda p: -p.available_blocks_count())
-        random.shuffle(persons_sorted)
+        rng.shuffle(persons_sorted)
+
+        # For each block, list the persons who are available for it, in the same (shuffled) order as persons_sorted.
+        # This uses the precomputed index, so only available persons have to be checked in the passes below.
+        rank = {person: i for i, person in enumerate(persons_sorted)}
+        block_candidates = [
+            sorted((self.persons[i] for i in indices), key=rank.__getitem__)
+            for indices in self.available_persons
+        ]
+        # The same per block, but split by availability level: level_candidates[b][level] is a list of persons.
+        level_candidates = [
+            {
+                level: sorted((self.persons[i] for i in indices), key=rank.__getitem__)
+                for level, indices in levels.items()
+            }
+            for levels in self.level_persons
+        ]
 
         # 4. Define the helper to assign blocks at a given availability level
         def assign_blocks(priority_level):
-            for block in self.blocks:
-                # Determine how many people are required for this block:
-                #   - If the time is '10-12', exactly 2 people are needed.
-                #   - Otherwise, 3 people are needed.
-                needed = 2 if block[1] == '10-12' else 3
-
+            # needed: how many people are required for this block (2 for '10-12', otherwise 3)
+            for b, (day_i, t_i, needed) in enumerate(self._blocks_info):
                 # Skip if block already has enough people
-                if len(slots[block]) >= needed:
+                if len(slots[b]) >= needed:
                     continue
 
                 # Find persons matching the criteria:
-                #   a) wants_block(block) == priority_level
+                #   a) wants_block(block) == priority_level (taken directly from the precomputed level groups)
                 #   b) assigned_hours + 2 <= max_blocks (enough capacity)
-                #   c) can_receive_block(block) (actually available for that slot)
                 eligible = [
-                    p for p in persons_sorted
-                    if p.wants_block(block) == priority_level
-                    and p.assigned_hours() + 2 <= p.max_blocks
-                    and p.can_receive_block(block)
+                    p for p in level_candidates[b].get(priority_level, [])
+                    if p.assigned_hours() + 2 <= p.max_blocks
                 ]
 
                 # Sort eligible persons to avoid creating gaps in a single day, then minimize assigned hours,
                 # and finally prefer those with fewer total availability remaining.
+                day_mask = self._day_masks[b]
                 eligible.sort(key=lambda p: (
                     # 0 if a block already assigned on that day, else 1 (prefer no-day-gap)
-                    0 if any(d == block[0] for d, t in p.assigned_blocks) else 1,
+                    0 if p.assigned_mask & day_mask else 1,
                     # Fewer assigned hours first
                     p.assigned_hours(),
                     # More remaining availability first (negative means more)
@@ -170,12 +481,12 @@ class Scheduler:
 
                 # Assign up to the needed number of persons for this block
                 for p in eligible:
-                    if len(slots[block]) < needed:
+                    if len(slots[b]) < needed:
                         # Skip if assigning this block would create a gap sequence
-                        if self._would_create_gap_sequence(p, block):
+                        if self._creates_gap(p, b):
                             continue
-                        p.add_block(block)
-                        slots[block].append(p.name)
+                        p.add_block(self.blocks[b])
+                        slots[b].append(p.name)
 
         # First pass: assign blocks for priority levels 3, then 2, then 1
         for level in [3, 2, 1]:
@@ -185,118 +496,186 @@ class Scheduler:
         # and fewer than 8 assigned hours gets extra blocks in chronological order
         for p in persons_sorted:
             if p.available_blocks_count() >= 5 and p.assigned_hours() < 8:
-                # List all blocks that the person can take and is not yet assigned
+                # List the indices of all blocks that the person can take and is not yet assigned.
+                # Bit b of "available but not assigned" answers both questions at once,
+                # instead of scanning the names in slots[b].
+                open_mask = p.available_mask & ~p.assigned_mask
                 additional_blocks = [
-                    block for block in self.blocks
-                    if p.can_receive_block(block) and p.name not in slots[block]
+                    b for b in range(len(self.blocks))
+                    if open_mask >> b & 1
                 ]
                 # Sort by day, then by time order
-                additional_blocks.sort(key=lambda x: (x[0], self.times.index(x[1])))
+                # (the time index of each block is already stored in self._blocks_info)
+                additional_blocks.sort(key=lambda b: (self.blocks[b][0], self._blocks_info[b][1]))
 
-                for block in additional_blocks:
-                    needed = 2 if block[1] == '10-12' else 3
-                    if len(slots[block]) < needed and p.assigned_hours() + 2 <= p.max_blocks:
-                        if self._would_create_gap_sequence(p, block):
+                for b in additional_blocks:
+                    needed = self._blocks_info[b][2]
+                    if len(slots[b]) < needed and p.assigned_hours() + 2 <= p.max_blocks:
+                        if self._creates_gap(p, b):
                             continue
-                        p.add_block(block)
-                        slots[block].append(p.name)
+                        p.add_block(self.blocks[b])
+                        slots[b].append(p.name)
 
         # Third pass: fill any remaining free slots regardless of priority,
         # choosing among those with capacity and availability
         free_blocks = [
-            block for block in self.blocks
-            if len(slots[block]) < (2 if block[1] == '10-12' else 3)
+            b for b in range(len(self.blocks))
+            if len(slots[b]) < self.needed[b]
         ]
-        for block in free_blocks:
-            needed = 2 if block[1] == '10-12' else 3
-            if len(slots[block]) >= needed:
+        for b in free_blocks:
+            needed = self._blocks_info[b][2]
+            if len(slots[b]) >= needed:
                 continue
 
             eligible = [
-                p for p in persons_sorted
-                if p.can_receive_block(block) and p.assigned_hours() + 2 <= p.max_blocks
+                p for p in block_candidates[b]
+                if p.assigned_hours() + 2 <= p.max_blocks
             ]
+            day_mask = self._day_masks[b]
             eligible.sort(key=lambda p: (
                 # 0 if a block already assigned on that day, else 1
-                0 if any(d == block[0] for d, t in p.assigned_blocks) else 1,
+                0 if p.assigned_mask & day_mask else 1,
                 # prefer those with less remaining availability (negative reversed)
                 -p.available_blocks_count(),
                 # fewer assigned hours first
                 p.assigned_hours()
             ))
             for p in eligible:
-                if len(slots[block]) < needed:
-                    if self._would_create_gap_sequence(p, block):
+                if len(slots[b]) < needed:
+                    if self._creates_gap(p, b):
                         continue
-                    p.add_block(block)
-                    slots[block].append(p.name)
-
-        # Build a list of assigned entries: each entry is a dictionary with 'Day', 'Time', and 'Person'
-        plan_data = []
-        for block in self.blocks:
-            for person_name in slots[block]:
-                plan_data.append({
-                    'Day': block[0],
-                    'Time': block[1],
-                    'Person': person_name
-                })
+                    p.add_block(self.blocks[b])
+                    slots[b].append(p.name)
+
+        # 8.–11. Turn the filled slots into the plan DataFrame
+        return self._plan_to_dataframe(slots)
+
+    def _plan_to_dataframe(self, slots):
+        """
+        Turn filled slots into a plan DataFrame with the columns Day, Time, Person and Hours.
+
+        Parameters:
+        - slots (list): For each block index b (position in self.blocks), the list of names assigned to that block.
+
+        Returns:
+        - pd.DataFrame: One row per assigned (day, time, person), with each person's total hours in "Hours".
+        """
+        # Collect the assigned entries in three parallel lists (one entry per assigned day, time and person).
+        # This avoids creating one dictionary per entry and lets pandas build each column in one go.
+        days_out = []
+        times_out = []
+        persons_out = []
+        for (day, time), names in zip(self.blocks, slots):
+            for person_name in names:
+                days_out.append(day)
+                times_out.append(time)
+                persons_out.append(person_name)
 
         # Calculate total hours per person (each block adds 2 hours)
-        block_hours = {'10-12': 2, '12-14': 2, '14-16': 2, '16-18': 2}
         hours_per_person = defaultdict(int)
-        for entry in plan_data:
-            hours_per_person[entry['Person']] += block_hours[entry['Time']]
-
-        # Create a DataFrame from plan_data and add a column "Hours"
-        df = pd.DataFrame(plan_data)
+        for time, person_name in zip(times_out, persons_out):
+            hours_per_person[person_name] += HOURS_PER_SLOT[time]
+
+        # Create a DataFrame from the three lists and add a column "Hours".
+        # The columns keep plain dtypes (text and int64), so callers can combine them like ordinary strings,
+        # e.g. plan["Day"] + " " + plan["Time"]; for a plan of a few dozen rows this is also the fastest to build.
+        df = pd.DataFrame({
+            'Day': days_out,
+            'Time': times_out,
+            'Person': persons_out
+        })
         df["Hours"] = df["Person"].map(hours_per_person)
 
         # Return the completed schedule DataFrame
         return df
 
-    def _would_create_gap_sequence(self, person, new_block):
+    @staticmethod
+    def _has_gap(available, assigned):
         """
-        Check whether assigning new_block to the person would create a “gap” on that same day.
+        Return True if the day described by the two bitmasks contains a gap.
+
+        Parameters:
+        - available (int): One bit per time slot of the day (bit 0 = first slot), set where the person is available.
+        - assigned (int): One bit per time slot of the day, set where the person is (or would be) assigned.
+
+        A gap is an available but unassigned slot between the first and last assigned slot.
+        Days with fewer than 3 available slots never count as having a gap.
+        """
+        if available.bit_count() < 3 or assigned == 0:
+            return False
+        first_idx = (assigned & -assigned).bit_length() - 1
+        last_idx = assigned.bit_length() - 1
+        for idx in range(first_idx, last_idx + 1):
+            if (available >> idx) & 1 and not (assigned >> idx) & 1:
+                return True
+        return False
+
+    def _creates_gap(self, person, b):
+        """
+        Check whether assigning the block with index b (position in self.blocks) to the person would create
+        a “gap” on that same day.
 
         A gap sequence means that the person would have an assigned slot in the morning and another
         in the afternoon but no slot in between, even though they are available in that middle slot.
         This method returns True if the new assignment would introduce such a gap.
 
+        A day has only a few time slots, so every possible combination of "available" and "assigned"
+        slots has been checked once in __init__ (see _has_gap) and stored in self._gap_table.
+
         Steps:
-          1. List all time slots on new_block’s day where the person is available (availability >= 1).
-          2. If fewer than 3 slots are available on that day, no gap is possible → return False.
-          3. Collect all currently assigned times on that day (from person.assigned_blocks).
-          4. Add new_block’s time to that list, then sort by the order in self.times.
-          5. If any time between the first and last assigned time is available but not assigned → return True.
-          6. Otherwise → return False.
+          1. Take the bits of all time slots on the block’s day where the person is available (availability >= 1).
+          2. Take the bits of all currently assigned times on that day and add the bit of the block’s time.
+          3. Look up the answer for this combination in self._gap_table.
         """
-        day, time = new_block
-        # Find all times on that day where the person’s availability >= 1
-        available = [
-            t for t in self.times
-            if person.availability.get((day, t), 0) >= 1
-        ]
-        # If fewer than 3 slots are available on that day, no risk of a gap
-        if len(available) < 3:
-            return False
+        # Day and time index of the block; the day's first block sits at position day_i * slots_per_day
+        day_i, t_i, _ = self._blocks_info[b]
+        day_start = day_i * self._slots_per_day
 
-        # List currently assigned times on that day
-        assigned = [t for d, t in person.assigned_blocks if d == day]
+        # Bits of the times on that day where the person’s availability >= 1
+        available = (person.available_mask >> day_start) & self._day_bits
+        # Bits of the currently assigned times on that day, plus the potential new time
+        assigned = ((person.assigned_mask >> day_start) & self._day_bits) | (1 << t_i)
 
-        # Combine assigned times with the potential new time, then sort
-        test_blocks = sorted(set(assigned + [time]), key=self.times.index)
+        return self._gap_table[(available << self._slots_per_day) | assigned]
 
-        # Check for any “gap” between the earliest and latest assigned slot
-        first_idx = min(self.times.index(t) for t in test_blocks)
-        last_idx = max(self.times.index(t) for t in test_blocks)
-        for idx in range(first_idx, last_idx + 1):
-            t = self.times[idx]
-            if t in available and t not in test_blocks:
-                # A gap is found: available but not assigned
-                return True
+    def _pivoted(self, plan_df):
+        """
+        Return the plan as a table with one row per Person, one column per Block (e.g. "Montag 10-12")
+        in chronological order, cells counting assignments (0 or 1), and a final "Total Hours" column.
 
-        # No gap detected
-        return False
+        The table is computed anew on every call and plan_df is not modified, so a plan that was edited in
+        between is always drawn and exported as it currently is. For a plan of a few dozen rows this is cheap.
+        """
+        # Position of each entry's block in self.blocks, from the day and time category codes
+        # (-1 for a day or time that is not part of the schedule; such entries are not counted)
+        day_codes = pd.Categorical(plan_df["Day"], categories=self.days).codes.astype(np.int64)
+        time_codes = pd.Categorical(plan_df["Time"], categories=self.times).codes.astype(np.int64)
+        block_ids = day_codes * self._slots_per_day + time_codes
+        valid = (day_codes >= 0) & (time_codes >= 0)
+
+        # Count how often each Person appears in each Block (0 or 1) in an integer matrix: pd.factorize gives
+        # the sorted names and each entry's row, np.add.at adds 1 per entry. This avoids grouping by text labels.
+        # Unlike np.unique, factorize also sorts a mix of text and numbers (e.g. a name typed as 1), and gives
+        # entries without a name (an empty cell) the row -1; those are left out, as in a pivot_table.
+        person_rows, person_names = pd.factorize(plan_df["Person"], sort=True)
+        valid &= person_rows >= 0
+        counts = np.zeros((len(person_names), len(self.blocks)), dtype=np.int64)
+        np.add.at(counts, (person_rows[valid], block_ids[valid]), 1)
+        # All columns appear in chronological order
+        pivot = pd.DataFrame(
+            counts,
+            index=pd.Index(person_names, name="Person"),
+            columns=pd.Index(self._full_order, name="Block"),
+        )
+
+        # Add a "Total Hours" column. Every row of a person carries the same "Hours" value (their total),
+        # so a plain Person -> Hours dictionary gives it without a groupby pass.
+        hours_per_person = dict(zip(plan_df["Person"], plan_df["Hours"]))
+        pivot["Total Hours"] = np.array(
+            [hours_per_person[name] for name in pivot.index], dtype=plan_df["Hours"].dtype
+        )
+
+        return pivot
 
     def visualize_plan(self, plan_df, filename="plan.png"):
         """
@@ -304,54 +683,51 @@ class Scheduler:
 
         Steps:
           1. If the plan DataFrame is empty, print a message and return immediately.
-          2. Add a "Block" column combining Day and Time (e.g., "Montag 10-12").
-          3. Define the order of all possible "Block" labels so that columns line up correctly.
-          4. Convert the "Block" column to a categorical type with that full order.
-          5. Pivot the table so each row is a Person, each column is a Block, and values count assignments (0 or 1).
-          6. Add a "Total Hours" column so that total assigned hours appear at the end of each row.
-          7. Draw a heatmap with seaborn, using color to show assigned slots.
+          2. Get the pivoted table from _pivoted: each row is a Person, each column is a Block in
+             chronological order, values count assignments (0 or 1), plus a final "Total Hours" column.
+          3. Draw a heatmap with matplotlib's pcolormesh, using color to show assigned slots.
              - Vertical lines highlight day boundaries.
              - The "Total Hours" value is drawn as text at the end of each row.
-          8. Save the figure to the given filename.
+          4. Save the figure to the given filename.
+
+        The same figure object is reused for every call on this Scheduler (it is cleared and resized),
+        so drawing several plans in a row does not build a new figure each time.
         """
         # If no assignments exist, indicate that no plan is available for visualization
         if plan_df.empty:
             print("Kein Plan zum Visualisieren.")
             return
 
-        # Combine Day and Time into a single string called "Block"
-        plan_df["Block"] = plan_df["Day"] + " " + plan_df["Time"]
-
-        # Define the full order of possible Block labels (Monday 10-12 → Friday 16-18)
-        day_order = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag']
-        time_order = ['10-12', '12-14', '14-16', '16-18']
-        full_order = [f"{day} {time}" for day in day_order for time in time_order]
-
-        # Convert "Block" column to categorical type with the specified order
-        plan_df["Block"] = pd.Categorical(plan_df["Block"], categories=full_order, ordered=True)
-
-        # Pivot so each row is a Person, each column is a Block, and values count assignments (0 or 1)
-        pivot = plan_df.pivot_table(
-            index="Person",
-            columns="Block",
-            aggfunc="size",
-            fill_value=0
-        )
-        # Ensure that all columns appear in the correct order
-        pivot = pivot.reindex(columns=full_order, fill_value=0)
-
-        # Add a "Total Hours" column using the first "Hours" entry for each person
-        pivot["Total Hours"] = plan_df.groupby("Person")["Hours"].first()
-
-        # Draw the heatmap
-        plt.figure(figsize=(len(full_order) * 0.6, len(pivot) * 0.5 + 1))
-        ax = sns.heatmap(
-            pivot.drop(columns=["Total Hours"]),  # Exclude the Total Hours from the colored grid
-            cmap="YlGnBu",                         # Color palette
-            linewidths=0.5,
-            linecolor='gray',
-            cbar=False
-        )
+        # Pivoted table (the same one export_excel writes)
+        pivot = self._pivoted(plan_df)
+        full_order = self._full_order
+
+        # Reuse the figure from the previous call (if any), cleared and resized for this plan
+        figsize = (len(full_order) * 0.6, len(pivot) * 0.5 + 1)
+        if self._fig is None:
+            # matplotlib takes a noticeable part of a second to import, so it is only loaded once a plan is
+            # actually drawn (Python keeps the module after the first import).
+            # Plans are only saved as image files, never shown on screen. Figures are therefore created directly
+            # (without pyplot), which needs no GUI backend and no global figure bookkeeping.
+            from matplotlib.figure import Figure
+            self._fig = Figure(figsize=figsize)
+        else:
+            self._fig.clear()
+            self._fig.set_size_inches(figsize)
+        fig = self._fig
+        ax = fig.subplots()
+
+        # Draw the heatmap: one colored cell per (person, block); Total Hours is excluded from the colored grid
+        grid = pivot.drop(columns=["Total Hours"]).to_numpy()
+        ax.pcolormesh(grid, cmap="YlGnBu", edgecolors='gray', linewidth=0.5)
+
+        # Rows top to bottom in table order, with a label in the middle of every row and column
+        ax.set_xlim(0, len(full_order))
+        ax.set_ylim(len(pivot), 0)
+        ax.set_xticks(np.arange(len(full_order)) + 0.5, labels=full_order, rotation=90)
+        ax.set_yticks(np.arange(len(pivot)) + 0.5, labels=pivot.index)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
 
         # Draw thicker vertical lines every 4 columns to separate days
         for i in range(4, len(full_order), 4):
@@ -369,44 +745,50 @@ class Scheduler:
                 fontweight='bold'
             )
 
-        plt.title("Arbeitsplan")
-        plt.xlabel("Zeitblöcke")
-        plt.ylabel("Mitarbeitende")
-        plt.xticks(rotation=90)
-        plt.tight_layout()
+        ax.set_title("Arbeitsplan")
+        ax.set_xlabel("Zeitblöcke")
+        ax.set_ylabel("Mitarbeitende")
+        fig.tight_layout()
 
-        # Save and close the figure
-        plt.savefig(filename)
-        plt.close()
+        # Save the figure as PNG
+        fig.savefig(filename, dpi=100)
         print(f"Workplan saved as: {filename}")
 
     def export_excel(self, plan_df, filename):
         """
         Export the schedule into an Excel file in a pivoted format.
 
+        The given plan_df is only read, never modified, so callers do not need to pass a copy.
+
         Steps:
-          1. Add a "Block" column by combining Day and Time.
-          2. Pivot so that each row is a Person, each column is a Block, and cells show assignment counts (0 or 1).
-          3. Add a "Total Hours" column summing the hours for each person.
-          4. Reset the index so that "Person" becomes a regular column again.
-          5. Write the resulting table to the specified Excel file.
+          1. Get the pivoted table from _pivoted: each row is a Person, each column is a Block in
+             chronological order, cells show assignment counts (0 or 1), plus a final "Total Hours" column.
+          2. Write a header row ("Person", the block labels, "Total Hours") to the specified Excel file.
+          3. Write one row per person: the name followed by that person's values from the integer table.
         """
-        # Combine Day and Time for each row
-        plan_df["Block"] = plan_df["Day"] + " " + plan_df["Time"]
-
-        # 2. Pivot to count how many times each person appears in each block
-        pivot = plan_df.pivot_table(
-            index="Person",
-            columns="Block",
-            aggfunc="size",
-            fill_value=0
-        )
-
-        # Add "Total Hours" by summing the "Hours" column for each person
-        pivot["Total Hours"] = plan_df.groupby("Person")["Hours"].first()
-
-        # Reset index so "Person" becomes a column again
-        pivot.reset_index().to_excel(filename, index=False)
+        # Pivoted table (the same one visualize_plan draws)
+        pivot = self._pivoted(plan_df)
+
+        # The person names become the first column. The values are taken as one integer matrix and turned into
+        # plain Python lists in one step, instead of copying the table with reset_index and iterating its rows.
+        header = [pivot.index.name] + [str(column) for column in pivot.columns]
+        values = pivot.to_numpy().tolist()
+
+        # The workbook is written with xlsxwriter in "constant_memory" mode: each row is written to disk as soon
+        # as the next row starts, so memory use stays flat however many persons the plan has.
+        # In this mode rows must be written strictly from top to bottom. DataFrame.to_excel writes column by
+        # column, which would lose data, so the rows are written here directly.
+        workbook = xlsxwriter.Workbook(filename, {"constant_memory": True})
+        try:
+            worksheet = workbook.add_worksheet()
+            # Same header look as DataFrame.to_excel: bold, thin border, centered
+            header_format = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+            worksheet.write_row(0, 0, header, header_format)
+            for row, (person_name, row_values) in enumerate(zip(pivot.index, values), start=1):
+                worksheet.write(row, 0, person_name)
+                worksheet.write_row(row, 1, row_values)
+        finally:
+            workbook.close()
 
         # Indicate that the Excel file was created successfully
         print(f"Excel exportiert als: {filename}")